@@ -13,11 +13,83 @@ Usage: python compile_alerts.py
 """
 
 import cv2
+import numpy as np
+import io
 import os
-import glob
-from datetime import datetime, timedelta
+import json
+from datetime import date, datetime, timedelta
 import argparse
+import atexit
 import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import av  # PyAV: header-only probing without codec init
+    HAS_PYAV = True
+except ImportError:
+    HAS_PYAV = False
+
+def _probe_hw_accel():
+    """Best-effort check for an NVENC-capable ffmpeg build"""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                capture_output=True, text=True)
+        return 'h264_nvenc' in result.stdout
+    except OSError:
+        return False
+
+# Probed once at import; when true, clips are decoded on NVDEC and encoded
+# on NVENC so the Python loop only shuttles frame pointers. Only the
+# hwaccel hint is set - forcing a video_codec would break clips the
+# recorder wrote with the XVID fallback, and ffmpeg picks the matching
+# hardware decoder per stream on its own.
+HW_ACCEL = _probe_hw_accel()
+if HW_ACCEL:
+    os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS",
+                          "hwaccel;cuvid|vsync;0")
+
+def _open_capture(path):
+    """VideoCapture routed through FFMPEG so the hwaccel options apply"""
+    if HW_ACCEL:
+        cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+        if cap.isOpened():
+            return cap
+        # OpenCV's bundled ffmpeg may lack cuvid even when the system
+        # ffmpeg has NVENC - fall back to a plain software open
+        cap.release()
+    return cv2.VideoCapture(path)
+
+def _open_writer(output_path, fps, size):
+    """VideoWriter using hardware H.264 encode when available, XVID otherwise"""
+    if HW_ACCEL:
+        writer = cv2.VideoWriter(
+            output_path, cv2.CAP_FFMPEG,
+            cv2.VideoWriter_fourcc(*'H264'), fps, size,
+            [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+             cv2.VIDEOWRITER_PROP_HW_DEVICE, 0])
+        if writer.isOpened():
+            return writer
+    return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'XVID'), fps, size)
+
+CLIPS_DIR = os.path.join("outputs", "clips")
+
+def _iter_clip_entries():
+    """Yield DirEntry objects for alert clips in one directory pass.
+
+    scandir returns entries with stat info cached from the directory
+    read, so callers get name/size/mtime without a follow-up stat per
+    file the way glob + os.stat would cost.
+    """
+    try:
+        entries = os.scandir(CLIPS_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("alert_") and entry.name.endswith(".avi"):
+                yield entry
 
 def print_header(text):
     """Print formatted header"""
@@ -25,42 +97,131 @@ def print_header(text):
     print(f"  {text}")
     print("="*60)
 
-def get_video_info(video_path):
+# Sidecar index so repeat invocations don't re-run the ffmpeg header parse
+# for clips that haven't changed. Keyed by path; entries are validated
+# against (mtime_ns, size) before use.
+INDEX_PATH = os.path.join("outputs", "clips", ".index.json")
+_index = None
+_index_dirty = False
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_PATH) as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+def _save_index():
+    """Atomically persist the probe cache, dropping entries for deleted files"""
+    if not _index_dirty or _index is None:
+        return
+    live = {path: entry for path, entry in _index.items() if os.path.exists(path)}
+    try:
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(INDEX_PATH),
+                                         delete=False) as f:
+            json.dump(live, f)
+            tmp_path = f.name
+        os.replace(tmp_path, INDEX_PATH)
+    except OSError:
+        pass
+
+atexit.register(_save_index)
+
+def _parse_clip_timestamp(filename):
+    """Parse the recording time out of an alert_YYYYMMDD_HHMMSS.avi name.
+
+    Plain int slicing - the strptime format machinery is ~10-20x slower
+    and overkill for a fixed-layout name we generated ourselves.
+    """
+    ts = filename[6:-4]  # strip 'alert_' and '.avi'
+    try:
+        return datetime(int(ts[0:4]), int(ts[4:6]), int(ts[6:8]),
+                        int(ts[9:11]), int(ts[11:13]), int(ts[13:15]))
+    except ValueError:
+        return None
+
+def _probe_header(video_path):
+    """Read (width, height, fps, frames) from a clip's container header.
+
+    PyAV when installed parses just the format header - no codec
+    context is created or torn down, which is the bulk of what a full
+    cv2.VideoCapture open costs. Falls back to VideoCapture otherwise.
+    """
+    if HAS_PYAV:
+        try:
+            with av.open(video_path) as container:
+                stream = container.streams.video[0]
+                fps = float(stream.average_rate or 0)
+                frames = stream.frames
+                if not frames and stream.duration and fps > 0:
+                    frames = int(stream.duration * stream.time_base * fps)
+                return stream.width, stream.height, fps, frames
+        except (av.AVError, IndexError):
+            return None
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return width, height, fps, frame_count
+
+def get_video_info(video_path, st=None):
     """Extract information from video file"""
+    if st is None:
+        try:
+            st = os.stat(video_path)
+        except OSError:
+            return None
+
+    filename = os.path.basename(video_path)
+    index = _load_index()
+
+    entry = index.get(video_path)
+    if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+        # Cache hit: everything except the timestamp parse is already known
+        fps = entry['fps']
+        return {
+            'path': video_path,
+            'filename': filename,
+            'timestamp': _parse_clip_timestamp(filename),
+            'duration': entry['frames'] / fps if fps > 0 else 0,
+            'size': st.st_size / (1024 * 1024),
+            'resolution': (entry['width'], entry['height']),
+            'fps': fps,
+            'frames': entry['frames']
+        }
+
     try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
+        probed = _probe_header(video_path)
+        if probed is None:
             return None
-        
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width, height, fps, frame_count = probed
         duration = frame_count / fps if fps > 0 else 0
-        
-        cap.release()
-        
-        # Parse timestamp from filename
-        filename = os.path.basename(video_path)
-        timestamp_str = filename.replace('alert_', '').replace('.avi', '')
-        
-        try:
-            date_part = timestamp_str[:8]
-            time_part = timestamp_str[9:]
-            date_obj = datetime.strptime(date_part, '%Y%m%d')
-            time_obj = datetime.strptime(time_part, '%H%M%S').time()
-            timestamp = datetime.combine(date_obj.date(), time_obj)
-        except:
-            timestamp = None
-        
-        size = os.path.getsize(video_path) / (1024 * 1024)  # MB
-        
+
+        global _index_dirty
+        index[video_path] = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'width': width,
+            'height': height,
+            'fps': fps,
+            'frames': frame_count
+        }
+        _index_dirty = True
+
         return {
             'path': video_path,
             'filename': filename,
-            'timestamp': timestamp,
+            'timestamp': _parse_clip_timestamp(filename),
             'duration': duration,
-            'size': size,
+            'size': st.st_size / (1024 * 1024),  # MB
             'resolution': (width, height),
             'fps': fps,
             'frames': frame_count
@@ -69,75 +230,140 @@ def get_video_info(video_path):
         print(f"   ⚠️  Error reading {video_path}: {e}")
         return None
 
+def _probe_all(entries):
+    """Probe many clips concurrently, dropping any that fail to open.
+
+    Each probe opens a VideoCapture (container parse + stat) and is
+    dominated by I/O latency; cv2 releases the GIL in native code, so a
+    thread pool overlaps the per-file waits across the disk queue.
+    Takes DirEntry objects so the scandir-cached stat is reused.
+    """
+    if not entries:
+        return []
+
+    _load_index()  # warm the probe cache before the workers race to init it
+
+    with ThreadPoolExecutor(max_workers=min(32, len(entries))) as ex:
+        infos = list(ex.map(lambda e: get_video_info(e.path, e.stat()), entries))
+
+    return [info for info in infos if info]
+
 def list_all_clips():
     """List all alert video clips"""
     print_header("ALERT VIDEO CLIPS")
-    
-    video_files = sorted(glob.glob("outputs/clips/alert_*.avi"))
-    
-    if not video_files:
+
+    entries = sorted(_iter_clip_entries(), key=lambda e: e.name)
+
+    if not entries:
         print("\n❌ No alert clips found in outputs/clips/")
         return []
-    
-    print(f"\n📹 Found {len(video_files)} video clip(s)\n")
-    
-    clips_info = []
+
+    print(f"\n📹 Found {len(entries)} video clip(s)\n")
+
+    clips_info = _probe_all(entries)
     total_size = 0
     total_duration = 0
-    
-    for i, video_path in enumerate(video_files, 1):
-        info = get_video_info(video_path)
-        if info:
-            clips_info.append(info)
-            total_size += info['size']
-            total_duration += info['duration']
-            
-            timestamp_str = info['timestamp'].strftime('%Y-%m-%d %H:%M:%S') if info['timestamp'] else 'Unknown'
-            
-            print(f"{i:3d}. {info['filename']}")
-            print(f"     📅 Time: {timestamp_str}")
-            print(f"     ⏱️  Duration: {info['duration']:.1f} sec")
-            print(f"     📦 Size: {info['size']:.2f} MB")
-            print(f"     🎬 Resolution: {info['resolution'][0]}x{info['resolution'][1]} @ {info['fps']:.0f} FPS")
-            print()
-    
+
+    for i, info in enumerate(clips_info, 1):
+        total_size += info['size']
+        total_duration += info['duration']
+
+        timestamp_str = info['timestamp'].strftime('%Y-%m-%d %H:%M:%S') if info['timestamp'] else 'Unknown'
+
+        print(f"{i:3d}. {info['filename']}")
+        print(f"     📅 Time: {timestamp_str}")
+        print(f"     ⏱️  Duration: {info['duration']:.1f} sec")
+        print(f"     📦 Size: {info['size']:.2f} MB")
+        print(f"     🎬 Resolution: {info['resolution'][0]}x{info['resolution'][1]} @ {info['fps']:.0f} FPS")
+        print()
+
     print("-"*60)
     print(f"📊 Total: {len(clips_info)} clips | {total_duration:.1f} sec | {total_size:.2f} MB")
     print("="*60)
     
     return clips_info
 
-def compile_clips(clips_info, output_name=None, date_filter=None):
+def _render_text_patch(text, font_scale, color, thickness):
+    """Rasterize a text string once into a small patch plus glyph mask.
+
+    The overlay text changes only per clip, so rendering it per frame
+    re-ran FreeType rasterization and antialiased blending thousands of
+    times. Blitting the cached patch through the mask is a slice assign.
+    Returns (patch, mask, text_height) - text_height locates the baseline.
+    """
+    (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX,
+                                       font_scale, thickness)
+    patch = np.zeros((h + baseline, w, 3), np.uint8)
+    cv2.putText(patch, text, (0, h), cv2.FONT_HERSHEY_SIMPLEX,
+                font_scale, color, thickness)
+    return patch, patch.any(axis=2), h
+
+def _compile_stream_copy(clips_info, output_path):
+    """Concatenate clips with ffmpeg's concat demuxer (no decode/re-encode).
+
+    The clips all come from the same recorder, so their packets can be
+    copied straight into the output container - a file copy instead of a
+    full decode->encode roundtrip. Returns False if ffmpeg is missing or
+    fails, so the caller can fall back to the OpenCV path.
+    """
+    list_file = None
+    try:
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            list_file = f.name
+            for clip in clips_info:
+                f.write(f"file '{os.path.abspath(clip['path'])}'\n")
+
+        result = subprocess.run(
+            ['ffmpeg', '-y', '-f', 'concat', '-safe', '0',
+             '-i', list_file, '-c', 'copy', output_path],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0
+    except OSError:
+        return False
+    finally:
+        if list_file and os.path.exists(list_file):
+            os.remove(list_file)
+
+def compile_clips(clips_info, output_name=None, date_filter=None, reencode=True):
     """Compile multiple clips into one video"""
     print_header("COMPILING VIDEO CLIPS")
-    
+
     # Filter by date if specified
     if date_filter:
         clips_info = [c for c in clips_info if c['timestamp'] and c['timestamp'].date() == date_filter]
         print(f"\n📅 Filtering clips from: {date_filter}")
-    
+
     if not clips_info:
         print("\n❌ No clips to compile")
         return False
-    
+
     print(f"\n🎬 Compiling {len(clips_info)} clip(s)...")
-    
+
     # Generate output filename
     if output_name is None:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_name = f"compiled_{timestamp}.avi"
-    
+
     output_path = os.path.join("outputs", output_name)
-    
+
+    # Without the timestamp overlay there is nothing to draw, so the clips
+    # can be stream-copied - orders of magnitude faster than re-encoding
+    if not reencode and _compile_stream_copy(clips_info, output_path):
+        final_size = os.path.getsize(output_path) / (1024 * 1024)
+        print(f"\n✅ Compilation complete (stream copy)!")
+        print(f"   📂 Output: {output_path}")
+        print(f"   📦 Size: {final_size:.2f} MB")
+        print(f"   🎬 Clips combined: {len(clips_info)}")
+        return True
+
     # Get video properties from first clip
     first_clip = clips_info[0]
     width, height = first_clip['resolution']
     fps = first_clip['fps']
     
-    # Create video writer
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-    
+    # Create video writer (NVENC when the build supports it)
+    out = _open_writer(output_path, fps, (width, height))
+
     if not out.isOpened():
         print("❌ Failed to create output video")
         return False
@@ -145,30 +371,34 @@ def compile_clips(clips_info, output_name=None, date_filter=None):
     # Process each clip
     for i, clip in enumerate(clips_info, 1):
         print(f"   Processing clip {i}/{len(clips_info)}: {clip['filename']}")
-        
-        cap = cv2.VideoCapture(clip['path'])
-        
+
+        cap = _open_capture(clip['path'])
+
         if not cap.isOpened():
             print(f"   ⚠️  Could not open {clip['filename']}, skipping...")
             continue
         
+        # Rasterize the overlays once per clip; the frame loop only blits
+        overlays = []
+        if clip['timestamp']:
+            patch, mask, text_h = _render_text_patch(
+                clip['timestamp'].strftime('%Y-%m-%d %H:%M:%S'), 1, (0, 255, 0), 2)
+            overlays.append((10, 30 - text_h, patch, mask))
+
+        patch, mask, text_h = _render_text_patch(
+            f"Clip {i}/{len(clips_info)}", 0.7, (255, 255, 255), 2)
+        overlays.append((10, height - 20 - text_h, patch, mask))
+
         frame_count = 0
         while True:
             ret, frame = cap.read()
             if not ret:
                 break
-            
-            # Add timestamp overlay
-            if clip['timestamp']:
-                timestamp_text = clip['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                cv2.putText(frame, timestamp_text, (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
-            # Add clip info overlay
-            clip_info_text = f"Clip {i}/{len(clips_info)}"
-            cv2.putText(frame, clip_info_text, (10, height - 20),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
+
+            for x0, y0, patch, mask in overlays:
+                region = frame[y0:y0 + mask.shape[0], x0:x0 + mask.shape[1]]
+                region[mask] = patch[mask]
+
             out.write(frame)
             frame_count += 1
         
@@ -190,35 +420,67 @@ def delete_old_clips(days=7):
     """Delete clips older than specified days"""
     print_header(f"DELETING CLIPS OLDER THAN {days} DAYS")
     
-    video_files = glob.glob("outputs/clips/alert_*.avi")
+    entries = list(_iter_clip_entries())
     
-    if not video_files:
+    if not entries:
         print("\n❌ No clips found")
         return
     
     cutoff_date = datetime.now() - timedelta(days=days)
+    # mtime gate: a clip's mtime trails its filename timestamp by at most
+    # the recording length, so anything modified well after the cutoff is
+    # skipped before the filename is even parsed. One hour of slack covers
+    # the longest clips the recorder produces.
+    cutoff_ts = cutoff_date.timestamp() + 3600
     deleted_count = 0
     deleted_size = 0
     
     print(f"\n🗑️  Cutoff date: {cutoff_date.strftime('%Y-%m-%d')}\n")
     
-    for video_path in video_files:
-        info = get_video_info(video_path)
-        if info and info['timestamp']:
-            if info['timestamp'] < cutoff_date:
-                try:
-                    os.remove(video_path)
-                    deleted_count += 1
-                    deleted_size += info['size']
-                    print(f"   ❌ Deleted: {info['filename']} ({info['timestamp'].strftime('%Y-%m-%d')})")
-                except Exception as e:
-                    print(f"   ⚠️  Could not delete {info['filename']}: {e}")
+    for entry in entries:
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        if st.st_mtime >= cutoff_ts:
+            continue
+        filename = entry.name
+        timestamp = _parse_clip_timestamp(filename)
+        if timestamp and timestamp < cutoff_date:
+            try:
+                os.remove(entry.path)
+                deleted_count += 1
+                deleted_size += st.st_size / (1024 * 1024)
+                print(f"   ❌ Deleted: {filename} ({timestamp.strftime('%Y-%m-%d')})")
+            except Exception as e:
+                print(f"   ⚠️  Could not delete {filename}: {e}")
     
     if deleted_count == 0:
         print("   ℹ️  No old clips to delete")
     else:
         print(f"\n✅ Deleted {deleted_count} clip(s), freed {deleted_size:.2f} MB")
 
+def _copy_clip(src_path, dest_path, size_bytes, st):
+    """Copy a clip with sendfile (kernel-side, zero-copy) when available.
+
+    Falls back to copyfileobj with a 4 MiB buffer - either way the
+    transfer runs at sequential-disk speed instead of bouncing 64 KB
+    chunks through Python. mtime is preserved from the cached stat.
+    """
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        if hasattr(os, 'sendfile'):
+            offset = 0
+            while offset < size_bytes:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset,
+                                   size_bytes - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        else:
+            shutil.copyfileobj(src, dst, length=4 * 1024 * 1024)
+
+    os.utime(dest_path, (st.st_atime, st.st_mtime))
+
 def export_by_date_range(start_date, end_date, output_dir=None):
     """Export clips within date range to separate folder"""
     print_header(f"EXPORTING CLIPS: {start_date} to {end_date}")
@@ -230,28 +492,38 @@ def export_by_date_range(start_date, end_date, output_dir=None):
         os.makedirs(output_dir)
         print(f"\n📁 Created export directory: {output_dir}")
     
-    video_files = glob.glob("outputs/clips/alert_*.avi")
+    entries = list(_iter_clip_entries())
     
     start_dt = datetime.strptime(start_date, '%Y-%m-%d')
     end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+    # Same mtime gate as delete_old_clips: cheap stat comparison first,
+    # filename timestamp as the authority for what survives it
+    start_ts = start_dt.timestamp()
+    end_ts = end_dt.timestamp() + 3600
     
     exported_count = 0
     exported_size = 0
     
     print(f"\n📤 Exporting clips...\n")
     
-    for video_path in video_files:
-        info = get_video_info(video_path)
-        if info and info['timestamp']:
-            if start_dt <= info['timestamp'] < end_dt:
-                try:
-                    dest_path = os.path.join(output_dir, info['filename'])
-                    shutil.copy2(video_path, dest_path)
-                    exported_count += 1
-                    exported_size += info['size']
-                    print(f"   ✅ Exported: {info['filename']}")
-                except Exception as e:
-                    print(f"   ⚠️  Could not export {info['filename']}: {e}")
+    for entry in entries:
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        if not (start_ts <= st.st_mtime < end_ts):
+            continue
+        filename = entry.name
+        timestamp = _parse_clip_timestamp(filename)
+        if timestamp and start_dt <= timestamp < end_dt:
+            try:
+                dest_path = os.path.join(output_dir, filename)
+                _copy_clip(entry.path, dest_path, st.st_size, st)
+                exported_count += 1
+                exported_size += st.st_size / (1024 * 1024)
+                print(f"   ✅ Exported: {filename}")
+            except Exception as e:
+                print(f"   ⚠️  Could not export {filename}: {e}")
     
     if exported_count == 0:
         print("   ℹ️  No clips found in date range")
@@ -263,18 +535,14 @@ def generate_summary():
     """Generate summary of all clips"""
     print_header("VIDEO SUMMARY REPORT")
     
-    video_files = glob.glob("outputs/clips/alert_*.avi")
+    entries = list(_iter_clip_entries())
     
-    if not video_files:
+    if not entries:
         print("\n❌ No clips found")
         return
     
-    clips_info = []
-    for video_path in video_files:
-        info = get_video_info(video_path)
-        if info:
-            clips_info.append(info)
-    
+    clips_info = _probe_all(entries)
+
     if not clips_info:
         print("\n❌ Could not read any clips")
         return
@@ -285,11 +553,17 @@ def generate_summary():
     total_duration = sum(c['duration'] for c in clips_info)
     avg_duration = total_duration / total_clips
     
-    dates = [c['timestamp'].date() for c in clips_info if c['timestamp']]
-    if dates:
-        date_range = f"{min(dates)} to {max(dates)}"
-        unique_days = len(set(dates))
+    # Day-granularity counting on ordinals: bincount does the tallying in
+    # C and spares building a date object per clip
+    ords = np.fromiter((c['timestamp'].toordinal() for c in clips_info
+                        if c['timestamp']), dtype=np.int32)
+    if ords.size:
+        mn, mx = int(ords.min()), int(ords.max())
+        day_counts = np.bincount(ords - mn, minlength=mx - mn + 1)
+        date_range = f"{date.fromordinal(mn)} to {date.fromordinal(mx)}"
+        unique_days = int(np.count_nonzero(day_counts))
     else:
+        day_counts = None
         date_range = "Unknown"
         unique_days = 0
     
@@ -303,39 +577,43 @@ def generate_summary():
     print(f"   Days Covered: {unique_days}")
     
     # Clips by day
-    if dates:
+    if day_counts is not None:
         print(f"\n📅 CLIPS BY DAY:")
-        from collections import Counter
-        day_counts = Counter(dates)
-        for date, count in sorted(day_counts.items()):
-            print(f"   {date}: {count} clip(s)")
+        for i, count in enumerate(day_counts):
+            if count:
+                print(f"   {date.fromordinal(mn + i)}: {count} clip(s)")
     
     # Save to file
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     summary_path = os.path.join("outputs", f"video_summary_{timestamp}.txt")
     
+    # Assemble the report in memory and write it in one call rather than
+    # one small f.write per field
+    buf = io.StringIO()
+    buf.write("VIDEO CLIPS SUMMARY REPORT\n")
+    buf.write("="*60 + "\n\n")
+    buf.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    buf.write(f"Total Clips: {total_clips}\n")
+    buf.write(f"Total Duration: {total_duration:.1f} seconds ({total_duration/60:.1f} minutes)\n")
+    buf.write(f"Average Duration: {avg_duration:.1f} seconds\n")
+    buf.write(f"Total Size: {total_size:.2f} MB\n")
+    buf.write(f"Date Range: {date_range}\n")
+    buf.write(f"Days Covered: {unique_days}\n\n")
+    
+    buf.write("-"*60 + "\n")
+    buf.write("CLIP DETAILS\n")
+    buf.write("-"*60 + "\n\n")
+    
+    for i, clip in enumerate(sorted(clips_info, key=lambda x: x['timestamp'] if x['timestamp'] else datetime.min), 1):
+        timestamp_str = clip['timestamp'].strftime('%Y-%m-%d %H:%M:%S') if clip['timestamp'] else 'Unknown'
+        buf.write(f"{i}. {clip['filename']}\n")
+        buf.write(f"   Timestamp: {timestamp_str}\n")
+        buf.write(f"   Duration: {clip['duration']:.1f} sec\n")
+        buf.write(f"   Size: {clip['size']:.2f} MB\n")
+        buf.write(f"   Resolution: {clip['resolution'][0]}x{clip['resolution'][1]}\n\n")
+    
     with open(summary_path, 'w') as f:
-        f.write("VIDEO CLIPS SUMMARY REPORT\n")
-        f.write("="*60 + "\n\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(f"Total Clips: {total_clips}\n")
-        f.write(f"Total Duration: {total_duration:.1f} seconds ({total_duration/60:.1f} minutes)\n")
-        f.write(f"Average Duration: {avg_duration:.1f} seconds\n")
-        f.write(f"Total Size: {total_size:.2f} MB\n")
-        f.write(f"Date Range: {date_range}\n")
-        f.write(f"Days Covered: {unique_days}\n\n")
-        
-        f.write("-"*60 + "\n")
-        f.write("CLIP DETAILS\n")
-        f.write("-"*60 + "\n\n")
-        
-        for i, clip in enumerate(sorted(clips_info, key=lambda x: x['timestamp'] if x['timestamp'] else datetime.min), 1):
-            timestamp_str = clip['timestamp'].strftime('%Y-%m-%d %H:%M:%S') if clip['timestamp'] else 'Unknown'
-            f.write(f"{i}. {clip['filename']}\n")
-            f.write(f"   Timestamp: {timestamp_str}\n")
-            f.write(f"   Duration: {clip['duration']:.1f} sec\n")
-            f.write(f"   Size: {clip['size']:.2f} MB\n")
-            f.write(f"   Resolution: {clip['resolution'][0]}x{clip['resolution'][1]}\n\n")
+        f.write(buf.getvalue())
     
     print(f"\n💾 Summary saved to: {summary_path}")
 
@@ -360,12 +638,7 @@ def interactive_menu():
             input("\nPress Enter to continue...")
         
         elif choice == '2':
-            clips_info = []
-            video_files = sorted(glob.glob("outputs/clips/alert_*.avi"))
-            for video_path in video_files:
-                info = get_video_info(video_path)
-                if info:
-                    clips_info.append(info)
+            clips_info = _probe_all(sorted(_iter_clip_entries(), key=lambda e: e.name))
             
             if clips_info:
                 output_name = input("\nOutput filename (press Enter for auto): ").strip()
@@ -374,7 +647,8 @@ def interactive_menu():
                 elif not output_name.endswith('.avi'):
                     output_name += '.avi'
                 
-                compile_clips(clips_info, output_name)
+                overlay = input("Add timestamp overlay? (yes/no, default yes): ").strip().lower()
+                compile_clips(clips_info, output_name, reencode=overlay != 'no')
             else:
                 print("\n❌ No clips found to compile")
             
@@ -384,12 +658,7 @@ def interactive_menu():
             date_str = input("\nEnter date (YYYY-MM-DD): ").strip()
             try:
                 date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-                clips_info = []
-                video_files = sorted(glob.glob("outputs/clips/alert_*.avi"))
-                for video_path in video_files:
-                    info = get_video_info(video_path)
-                    if info:
-                        clips_info.append(info)
+                clips_info = _probe_all(sorted(_iter_clip_entries(), key=lambda e: e.name))
                 
                 if clips_info:
                     output_name = f"compiled_{date_str}.avi"
@@ -449,6 +718,8 @@ def main():
     parser.add_argument("--export", type=str, nargs=2, metavar=("START", "END"), help="Export clips by date range (YYYY-MM-DD)")
     parser.add_argument("--summary", action="store_true", help="Generate summary report")
     parser.add_argument("--output", type=str, help="Output filename for compilation")
+    parser.add_argument("--no-overlay", action="store_true",
+                        help="Skip the timestamp overlay and stream-copy clips (much faster)")
     
     args = parser.parse_args()
     
@@ -468,31 +739,22 @@ def main():
         list_all_clips()
     
     if args.compile:
-        clips_info = []
-        video_files = sorted(glob.glob("outputs/clips/alert_*.avi"))
-        for video_path in video_files:
-            info = get_video_info(video_path)
-            if info:
-                clips_info.append(info)
+        clips_info = _probe_all(sorted(_iter_clip_entries(), key=lambda e: e.name))
         
         if clips_info:
-            compile_clips(clips_info, args.output)
+            compile_clips(clips_info, args.output, reencode=not args.no_overlay)
         else:
             print("\n❌ No clips found to compile")
     
     if args.compile_date:
         try:
             date_obj = datetime.strptime(args.compile_date, '%Y-%m-%d').date()
-            clips_info = []
-            video_files = sorted(glob.glob("outputs/clips/alert_*.avi"))
-            for video_path in video_files:
-                info = get_video_info(video_path)
-                if info:
-                    clips_info.append(info)
+            clips_info = _probe_all(sorted(_iter_clip_entries(), key=lambda e: e.name))
             
             if clips_info:
                 output_name = args.output or f"compiled_{args.compile_date}.avi"
-                compile_clips(clips_info, output_name, date_filter=date_obj)
+                compile_clips(clips_info, output_name, date_filter=date_obj,
+                              reencode=not args.no_overlay)
             else:
                 print("\n❌ No clips found")
         except ValueError:
@@ -0,0 +1,76 @@
+"""
+Shared YOLO output decoding
+
+Any script running the network should import decode_detections from
+here instead of carrying its own copy of the decode loop, so speedups
+(vectorization, the numba fast path) land in one place.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _decode_jit(det, width, height, conf_thresh):
+        """Fused argmax + threshold + box decode in one compiled pass.
+
+        Does the same work as the NumPy path below but in a single
+        sweep over the candidates, with no intermediate arrays.
+        """
+        n = det.shape[0]
+        boxes = np.empty((n, 4), np.int32)
+        confs = np.empty(n, np.float32)
+        cids = np.empty(n, np.int32)
+        m = 0
+        for j in range(n):
+            best = np.float32(0.0)
+            cid = 0
+            for c in range(5, det.shape[1]):
+                s = det[j, c]
+                if s > best:
+                    best = s
+                    cid = c - 5
+            if best > conf_thresh:
+                bw = det[j, 2] * width
+                bh = det[j, 3] * height
+                boxes[m, 0] = np.int32(det[j, 0] * width - bw / 2)
+                boxes[m, 1] = np.int32(det[j, 1] * height - bh / 2)
+                boxes[m, 2] = np.int32(bw)
+                boxes[m, 3] = np.int32(bh)
+                confs[m] = best
+                cids[m] = cid
+                m += 1
+        return boxes[:m], confs[:m], cids[:m]
+
+def decode_detections(outs, width, height, conf_thresh):
+    """Decode raw YOLO outputs into (boxes, confidences, class_ids) lists.
+
+    Vectorized postprocess: one pass over the stacked (N, 85) candidate
+    array instead of a Python loop over ~10k boxes per frame; the numba
+    build fuses it into a single compiled sweep.
+    """
+    det = np.concatenate(outs, axis=0)
+    if HAS_NUMBA:
+        boxes_a, confs_a, cids_a = _decode_jit(det, width, height,
+                                               np.float32(conf_thresh))
+        return (boxes_a.tolist(), confs_a.astype(float).tolist(),
+                cids_a.tolist())
+
+    scores = det[:, 5:]
+    cids = scores.argmax(axis=1)
+    confs = scores[np.arange(len(scores)), cids]
+    keep = confs > conf_thresh
+    det, cids, confs = det[keep], cids[keep], confs[keep]
+
+    cx = det[:, 0] * width
+    cy = det[:, 1] * height
+    bw = det[:, 2] * width
+    bh = det[:, 3] * height
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, bw, bh],
+                     axis=1).astype(np.int32).tolist()
+    return boxes, confs.astype(float).tolist(), cids.tolist()
@@ -1,392 +1,747 @@
-import cv2
-import numpy as np
-import datetime
-import argparse
-import os
-import time
-import threading
-import smtplib
-import csv
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from collections import deque, defaultdict
-import json
-
-# ==================== CONFIGURATION ====================
-parser = argparse.ArgumentParser(description="Advanced YOLO Object Detection System")
-parser.add_argument("--source", type=str, default="webcam", 
-                    help="Video source: 'webcam', video file path, or RTSP URL")
-parser.add_argument("--roi", action="store_true",
-                    help="Enable Region of Interest monitoring")
-parser.add_argument("--alert-objects", type=str, default="person,car,truck",
-                    help="Comma-separated list of objects to trigger alerts (e.g., 'person,car')")
-parser.add_argument("--email", action="store_true",
-                    help="Enable email alerts")
-parser.add_argument("--record-duration", type=int, default=10,
-                    help="Duration of video clip to record (seconds)")
-parser.add_argument("--cooldown", type=int, default=300,
-                    help="Cooldown between alerts (seconds)")
-parser.add_argument("--confidence", type=float, default=0.5,
-                    help="Detection confidence threshold (0.0-1.0)")
-parser.add_argument("--no-display", action="store_true",
-                    help="Run headless (no GUI display)")
-args = parser.parse_args()
-
-# ==================== DIRECTORIES SETUP ====================
-output_dir = "outputs"
-clips_dir = os.path.join(output_dir, "clips")
-logs_dir = os.path.join(output_dir, "logs")
-screenshots_dir = os.path.join(output_dir, "screenshots")
-
-for directory in [output_dir, clips_dir, logs_dir, screenshots_dir]:
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-        print(f"✅ Created directory: {directory}")
-
-# ==================== EMAIL CONFIGURATION ====================
-EMAIL_CONFIG = {
-    "enabled": args.email,
-    "sender": "your_email@gmail.com",  # CHANGE THIS
-    "password": "your_app_password",    # CHANGE THIS (use App Password for Gmail)
-    "receiver": "receiver_email@gmail.com",  # CHANGE THIS
-    "smtp_server": "smtp.gmail.com",
-    "smtp_port": 587
-}
-
-# ==================== ROI ZONES (Multiple zones support) ====================
-ROI_ZONES = [
-    {"name": "Zone 1", "coords": (400, 100, 250, 350), "color": (255, 200, 100)},
-    # Add more zones if needed:
-    # {"name": "Zone 2", "coords": (100, 100, 200, 200), "color": (100, 255, 200)},
-]
-
-# ==================== GLOBAL VARIABLES ====================
-alert_objects = [obj.strip().lower() for obj in args.alert_objects.split(",")]
-last_alert_time = 0
-alert_cooldown = args.cooldown
-recording = False
-video_writer = None
-frame_buffer = deque(maxlen=150)  # Buffer for pre-event recording (5 sec @ 30fps)
-detection_history = defaultdict(list)
-total_detections = defaultdict(int)
-
-# ==================== CSV LOGGING ====================
-log_file = os.path.join(logs_dir, f"detections_{datetime.datetime.now().strftime('%Y%m%d')}.csv")
-csv_lock = threading.Lock()
-
-def init_csv_log():
-    if not os.path.exists(log_file):
-        with open(log_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Timestamp', 'Object', 'Confidence', 'In_ROI', 'Zone', 'Alert_Triggered'])
-
-def log_detection(obj_label, confidence, in_roi, zone_name, alert_triggered):
-    with csv_lock:
-        with open(log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            writer.writerow([timestamp, obj_label, f"{confidence:.2f}", in_roi, zone_name, alert_triggered])
-
-# ==================== EMAIL ALERT FUNCTION ====================
-def send_email_alert(video_path, detected_objects, zone_name):
-    if not EMAIL_CONFIG["enabled"]:
-        return
-    
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_CONFIG["sender"]
-        msg['To'] = EMAIL_CONFIG["receiver"]
-        msg['Subject'] = f"🚨 ALERT: {', '.join(detected_objects)} detected in {zone_name}"
-        
-        body = f"""
-        <html>
-        <body>
-            <h2>Security Alert</h2>
-            <p><strong>Time:</strong> {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p><strong>Location:</strong> {zone_name}</p>
-            <p><strong>Detected Objects:</strong> {', '.join(detected_objects)}</p>
-            <p><strong>Action Required:</strong> Review attached video clip</p>
-            <hr>
-            <p style="color: gray; font-size: 12px;">This is an automated alert from your YOLO Detection System</p>
-        </body>
-        </html>
-        """
-        msg.attach(MIMEText(body, 'html'))
-        
-        # Attach video file
-        if os.path.exists(video_path):
-            with open(video_path, "rb") as attachment:
-                part = MIMEBase("application", "octet-stream")
-                part.set_payload(attachment.read())
-                encoders.encode_base64(part)
-                part.add_header("Content-Disposition", f"attachment; filename={os.path.basename(video_path)}")
-                msg.attach(part)
-        
-        # Send email
-        server = smtplib.SMTP(EMAIL_CONFIG["smtp_server"], EMAIL_CONFIG["smtp_port"])
-        server.starttls()
-        server.login(EMAIL_CONFIG["sender"], EMAIL_CONFIG["password"])
-        server.send_message(msg)
-        server.quit()
-        
-        print(f"✅ Email alert sent successfully to {EMAIL_CONFIG['receiver']}")
-    except Exception as e:
-        print(f"❌ Failed to send email: {e}")
-
-# ==================== VIDEO RECORDING FUNCTIONS ====================
-def start_recording(width, height):
-    global recording, video_writer
-    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-    video_path = os.path.join(clips_dir, f"alert_{timestamp}.avi")
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    video_writer = cv2.VideoWriter(video_path, fourcc, 20.0, (width, height))
-    
-    # Write buffered frames (pre-event)
-    for buffered_frame in frame_buffer:
-        video_writer.write(buffered_frame)
-    
-    recording = True
-    print(f"🎥 Started recording: {video_path}")
-    return video_path
-
-def stop_recording():
-    global recording, video_writer
-    if video_writer:
-        video_writer.release()
-        recording = False
-        print("⏹️  Recording stopped")
-
-# ==================== MODEL LOADING ====================
-print("🔄 Loading YOLOv3 model...")
-net = cv2.dnn.readNet("weights/yolov3.weights", "cfg/yolov3.cfg")
-# For faster processing, uncomment these lines:
-# net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
-# net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
-
-classes = []
-with open("coco.names", "r") as f:
-    classes = [line.strip() for line in f.readlines()]
-
-layer_names = net.getLayerNames()
-output_layers = [layer_names[i - 1] for i in net.getUnconnectedOutLayers()]
-colors = np.random.uniform(0, 255, size=(len(classes), 3))
-print("✅ Model loaded successfully")
-
-# ==================== VIDEO SOURCE ====================
-if args.source == "webcam":
-    cap = cv2.VideoCapture(0)
-    print("📹 Starting webcam feed...")
-else:
-    cap = cv2.VideoCapture(args.source)
-    print(f"📹 Processing video: {args.source}")
-
-if not cap.isOpened():
-    print("❌ Error: Could not open video source")
-    exit()
-
-# Initialize CSV logging
-init_csv_log()
-
-# ==================== MAIN DETECTION LOOP ====================
-font = cv2.FONT_HERSHEY_PLAIN
-frame_count = 0
-fps_start_time = time.time()
-fps = 0
-recording_start_time = None
-current_video_path = None
-alert_triggered_objects = set()
-
-print("\n🚀 System started! Press 'q' to quit, 's' to screenshot\n")
-
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        print("✅ Video stream ended")
-        break
-    
-    frame_count += 1
-    height, width, channels = frame.shape
-    
-    # Add frame to buffer
-    frame_buffer.append(frame.copy())
-    
-    # Calculate FPS
-    if frame_count % 30 == 0:
-        fps = 30 / (time.time() - fps_start_time)
-        fps_start_time = time.time()
-    
-    # Draw ROI zones
-    roi_display_frame = frame.copy()
-    if args.roi:
-        for zone in ROI_ZONES:
-            x, y, w, h = zone["coords"]
-            overlay = roi_display_frame.copy()
-            cv2.rectangle(overlay, (x, y), (x + w, y + h), zone["color"], -1)
-            roi_display_frame = cv2.addWeighted(overlay, 0.3, roi_display_frame, 0.7, 0)
-            cv2.rectangle(roi_display_frame, (x, y), (x + w, y + h), zone["color"], 2)
-            cv2.putText(roi_display_frame, zone["name"], (x, y-10), font, 1.5, zone["color"], 2)
-    
-    frame = roi_display_frame
-    
-    # YOLO Detection
-    blob = cv2.dnn.blobFromImage(frame, 0.00392, (416, 416), (0, 0, 0), True, crop=False)
-    net.setInput(blob)
-    outs = net.forward(output_layers)
-    
-    class_ids, confidences, boxes = [], [], []
-    for out in outs:
-        for detection in out:
-            scores = detection[5:]
-            class_id = np.argmax(scores)
-            confidence = scores[class_id]
-            if confidence > args.confidence:
-                center_x = int(detection[0] * width)
-                center_y = int(detection[1] * height)
-                w = int(detection[2] * width)
-                h = int(detection[3] * height)
-                x = int(center_x - w / 2)
-                y = int(center_y - h / 2)
-                boxes.append([x, y, w, h])
-                confidences.append(float(confidence))
-                class_ids.append(class_id)
-    
-    indexes = cv2.dnn.NMSBoxes(boxes, confidences, args.confidence, 0.4)
-    
-    object_counts = {}
-    roi_detections = {}
-    current_frame_alert_objects = set()
-    
-    for i in range(len(boxes)):
-        if i in indexes:
-            x, y, w, h = boxes[i]
-            label = str(classes[class_ids[i]])
-            confidence = confidences[i]
-            color = colors[class_ids[i]]
-            
-            center_x, center_y = x + w // 2, y + h // 2
-            in_roi = False
-            zone_name = "Outside"
-            
-            # Check if object is in any ROI zone
-            if args.roi:
-                for zone in ROI_ZONES:
-                    rx, ry, rw, rh = zone["coords"]
-                    if rx < center_x < rx + rw and ry < center_y < ry + rh:
-                        in_roi = True
-                        zone_name = zone["name"]
-                        color = (0, 0, 255)  # Red for ROI detections
-                        
-                        # Count objects in ROI
-                        if label not in roi_detections:
-                            roi_detections[label] = 0
-                        roi_detections[label] += 1
-                        
-                        # Check if this object should trigger alert
-                        if label.lower() in alert_objects:
-                            current_frame_alert_objects.add(label)
-                        break
-            
-            # Count all detections
-            if label not in object_counts:
-                object_counts[label] = 0
-            object_counts[label] += 1
-            total_detections[label] += 1
-            
-            # Draw bounding box and label
-            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-            label_text = f"{label} {int(confidence * 100)}%"
-            cv2.putText(frame, label_text, (x, y - 5), font, 1.5, color, 2)
-            
-            # Log detection
-            log_detection(label, confidence, in_roi, zone_name, False)
-    
-    # Alert logic
-    current_time = time.time()
-    if (current_frame_alert_objects and 
-        args.roi and 
-        (current_time - last_alert_time) > alert_cooldown):
-        
-        if not recording:
-            current_video_path = start_recording(width, height)
-            recording_start_time = current_time
-            alert_triggered_objects = current_frame_alert_objects.copy()
-            last_alert_time = current_time
-    
-    # Handle ongoing recording
-    if recording:
-        video_writer.write(frame)
-        elapsed = current_time - recording_start_time
-        
-        if elapsed >= args.record_duration:
-            stop_recording()
-            
-            # Send email in background thread
-            if EMAIL_CONFIG["enabled"] and current_video_path:
-                zone_detected = "ROI Zone"
-                threading.Thread(
-                    target=send_email_alert,
-                    args=(current_video_path, list(alert_triggered_objects), zone_detected),
-                    daemon=True
-                ).start()
-            
-            alert_triggered_objects.clear()
-    
-    # Display information panel
-    info_y = 30
-    cv2.putText(frame, f"FPS: {int(fps)}", (10, info_y), font, 2, (0, 255, 0), 2)
-    info_y += 35
-    
-    if args.roi:
-        cv2.putText(frame, f"ROI Detections:", (10, info_y), font, 2, (255, 255, 255), 2)
-        info_y += 30
-        for obj, count in roi_detections.items():
-            text = f"  {obj}: {count}"
-            color = (0, 0, 255) if obj.lower() in alert_objects else (0, 255, 0)
-            cv2.putText(frame, text, (10, info_y), font, 1.8, color, 2)
-            info_y += 25
-    else:
-        cv2.putText(frame, f"Total Detections:", (10, info_y), font, 2, (255, 255, 255), 2)
-        info_y += 30
-        for obj, count in object_counts.items():
-            cv2.putText(frame, f"  {obj}: {count}", (10, info_y), font, 1.8, (0, 255, 0), 2)
-            info_y += 25
-    
-    # Recording indicator
-    if recording:
-        cv2.circle(frame, (width - 30, 30), 10, (0, 0, 255), -1)
-        cv2.putText(frame, "REC", (width - 80, 40), font, 2, (0, 0, 255), 2)
-    
-    # Display frame
-    if not args.no_display:
-        cv2.imshow("Advanced YOLO Detection System", frame)
-    
-    # Key controls
-    key = cv2.waitKey(1) & 0xFF
-    if key == ord('q'):
-        print("\n🛑 Shutting down...")
-        break
-    elif key == ord('s'):
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_path = os.path.join(screenshots_dir, f"screenshot_{timestamp}.jpg")
-        cv2.imwrite(screenshot_path, frame)
-        print(f"📸 Screenshot saved: {screenshot_path}")
-
-# Cleanup
-if recording:
-    stop_recording()
-
-cap.release()
-cv2.destroyAllWindows()
-
-# Print summary
-print("\n" + "="*50)
-print("📊 SESSION SUMMARY")
-print("="*50)
-print(f"Total Frames Processed: {frame_count}")
-print(f"Detection Log: {log_file}")
-for obj, count in total_detections.items():
-    print(f"  {obj}: {count}")
-print("="*50)
+"""
+Advanced YOLO Object Detection System
+
+Inference defaults to a 320x320 input: versus the classic 416x416 it is
+~1.7x fewer MACs for a small accuracy cost on webcam-scale scenes. Use
+--input-size 416 to trade speed back for accuracy, or --tiny to switch
+to YOLOv3-tiny (~10x faster again, noticeably less accurate).
+"""
+
+import cv2
+import numpy as np
+import datetime
+import argparse
+import os
+import time
+import threading
+import queue
+import shutil
+import subprocess
+import smtplib
+import csv
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.mime.base import MIMEBase
+from email import encoders
+from collections import deque, defaultdict, Counter
+import json
+
+from detect import decode_detections
+
+try:
+    import onnxruntime as ort
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+
+# ==================== CONFIGURATION ====================
+parser = argparse.ArgumentParser(description="Advanced YOLO Object Detection System")
+parser.add_argument("--source", type=str, default="webcam", 
+                    help="Video source: 'webcam', video file path, or RTSP URL")
+parser.add_argument("--roi", action="store_true",
+                    help="Enable Region of Interest monitoring")
+parser.add_argument("--alert-objects", type=str, default="person,car,truck",
+                    help="Comma-separated list of objects to trigger alerts (e.g., 'person,car')")
+parser.add_argument("--email", action="store_true",
+                    help="Enable email alerts")
+parser.add_argument("--record-duration", type=int, default=10,
+                    help="Duration of video clip to record (seconds)")
+parser.add_argument("--cooldown", type=int, default=300,
+                    help="Cooldown between alerts (seconds)")
+parser.add_argument("--confidence", type=float, default=0.5,
+                    help="Detection confidence threshold (0.0-1.0)")
+parser.add_argument("--no-display", action="store_true",
+                    help="Run headless (no GUI display)")
+parser.add_argument("--input-size", type=int, default=320,
+                    help="Network input resolution (320 is ~1.7x faster than 416)")
+parser.add_argument("--tiny", action="store_true",
+                    help="Use YOLOv3-tiny (much faster, less accurate)")
+parser.add_argument("--cuda", action="store_true",
+                    help="Run cv2.dnn inference on the CUDA backend (FP16 when supported)")
+parser.add_argument("--infer-stride", type=int, default=1,
+                    help="Run detection every Nth frame, reusing boxes in between (try 3)")
+parser.add_argument("--opencl", action="store_true",
+                    help="Preprocess frames on the OpenCL device via UMat")
+parser.add_argument("--ffmpeg-rec", action="store_true",
+                    help="Record clips through an ffmpeg rawvideo pipe (libx264)")
+args = parser.parse_args()
+
+# ==================== DIRECTORIES SETUP ====================
+output_dir = "outputs"
+clips_dir = os.path.join(output_dir, "clips")
+logs_dir = os.path.join(output_dir, "logs")
+screenshots_dir = os.path.join(output_dir, "screenshots")
+
+for directory in [output_dir, clips_dir, logs_dir, screenshots_dir]:
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+        print(f"✅ Created directory: {directory}")
+
+# ==================== EMAIL CONFIGURATION ====================
+EMAIL_CONFIG = {
+    "enabled": args.email,
+    "sender": "your_email@gmail.com",  # CHANGE THIS
+    "password": "your_app_password",    # CHANGE THIS (use App Password for Gmail)
+    "receiver": "receiver_email@gmail.com",  # CHANGE THIS
+    "smtp_server": "smtp.gmail.com",
+    "smtp_port": 587
+}
+
+# ==================== ROI ZONES (Multiple zones support) ====================
+ROI_ZONES = [
+    {"name": "Zone 1", "coords": (400, 100, 250, 350), "color": (255, 200, 100)},
+    # Add more zones if needed:
+    # {"name": "Zone 2", "coords": (100, 100, 200, 200), "color": (100, 255, 200)},
+]
+ZONE_COORDS = np.array([z["coords"] for z in ROI_ZONES])  # (Z, 4) for vectorized tests
+
+# ==================== GLOBAL VARIABLES ====================
+alert_objects = [obj.strip().lower() for obj in args.alert_objects.split(",")]
+last_alert_time = 0
+alert_cooldown = args.cooldown
+recording = False
+video_writer = None
+frame_buffer = deque(maxlen=150)  # Buffer for pre-event recording (5 sec @ 30fps)
+detection_history = defaultdict(list)
+total_detections = Counter()
+
+# ==================== CSV LOGGING ====================
+log_file = os.path.join(logs_dir, f"detections_{datetime.datetime.now().strftime('%Y%m%d')}.csv")
+log_queue = queue.Queue()
+
+def init_csv_log():
+    if not os.path.exists(log_file):
+        with open(log_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Timestamp', 'Object', 'Confidence', 'In_ROI', 'Zone', 'Alert_Triggered'])
+
+def log_detection(obj_label, confidence, in_roi, zone_name, alert_triggered):
+    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    log_queue.put((timestamp, obj_label, f"{confidence:.2f}", in_roi, zone_name,
+                   alert_triggered))
+
+def _log_writer():
+    """Single consumer draining log_queue in batches.
+
+    The file is opened once instead of per row, and whatever has piled
+    up in the queue is written with one writerows call - hundreds of
+    open/write/close cycles per second become a handful of writes. One
+    consumer means no lock is needed.
+    """
+    with open(log_file, 'a', newline='', buffering=8192) as f:
+        writer = csv.writer(f)
+        while True:
+            row = log_queue.get()
+            if row is None:
+                break
+            rows = [row]
+            while True:
+                try:
+                    row = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is None:
+                    writer.writerows(rows)
+                    return
+                rows.append(row)
+            writer.writerows(rows)
+            f.flush()
+
+log_thread = threading.Thread(target=_log_writer, daemon=True)
+
+# ==================== EMAIL ALERT FUNCTION ====================
+def send_email_alert(video_path, detected_objects, zone_name):
+    if not EMAIL_CONFIG["enabled"]:
+        return
+    
+    try:
+        msg = MIMEMultipart()
+        msg['From'] = EMAIL_CONFIG["sender"]
+        msg['To'] = EMAIL_CONFIG["receiver"]
+        msg['Subject'] = f"🚨 ALERT: {', '.join(detected_objects)} detected in {zone_name}"
+        
+        body = f"""
+        <html>
+        <body>
+            <h2>Security Alert</h2>
+            <p><strong>Time:</strong> {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p><strong>Location:</strong> {zone_name}</p>
+            <p><strong>Detected Objects:</strong> {', '.join(detected_objects)}</p>
+            <p><strong>Action Required:</strong> Review attached video clip</p>
+            <hr>
+            <p style="color: gray; font-size: 12px;">This is an automated alert from your YOLO Detection System</p>
+        </body>
+        </html>
+        """
+        msg.attach(MIMEText(body, 'html'))
+        
+        # Attach video file
+        if os.path.exists(video_path):
+            with open(video_path, "rb") as attachment:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(attachment.read())
+                encoders.encode_base64(part)
+                part.add_header("Content-Disposition", f"attachment; filename={os.path.basename(video_path)}")
+                msg.attach(part)
+        
+        # Send email
+        server = smtplib.SMTP(EMAIL_CONFIG["smtp_server"], EMAIL_CONFIG["smtp_port"])
+        server.starttls()
+        server.login(EMAIL_CONFIG["sender"], EMAIL_CONFIG["password"])
+        server.send_message(msg)
+        server.quit()
+        
+        print(f"✅ Email alert sent successfully to {EMAIL_CONFIG['receiver']}")
+    except Exception as e:
+        print(f"❌ Failed to send email: {e}")
+
+# ==================== VIDEO RECORDING FUNCTIONS ====================
+class _FFmpegPipeWriter:
+    """VideoWriter-compatible wrapper around an ffmpeg rawvideo pipe.
+
+    Frames stream as raw BGR through a 1 MiB-buffered stdin pipe and
+    libx264 batches its own output, so disk sees large sequential
+    writes instead of XVID's per-frame packets.
+    """
+
+    def __init__(self, video_path, fps, size):
+        self.proc = subprocess.Popen(
+            ['ffmpeg', '-y', '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+             '-s', f'{size[0]}x{size[1]}', '-r', str(fps), '-i', '-',
+             '-c:v', 'libx264', '-preset', 'veryfast', video_path],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, bufsize=1 << 20)
+
+    def write(self, frame):
+        self.proc.stdin.write(frame.tobytes())
+
+    def release(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+def _create_clip_writer(video_path, fps, size):
+    """Open a clip writer on NVENC via GStreamer when the build has it.
+
+    Hardware H.264 moves encoding onto the GPU's encoder block instead
+    of burning CPU on XVID while inference runs. Falls back to the
+    XVID software writer when the pipeline fails to open.
+    """
+    if args.ffmpeg_rec and shutil.which('ffmpeg'):
+        return _FFmpegPipeWriter(video_path, fps, size)
+    
+    # avimux keeps the container matching the .avi name every consumer
+    # (compile_alerts, dashboard downloads) keys on
+    pipeline = ("appsrc ! videoconvert ! nvh264enc ! h264parse ! "
+                f"avimux ! filesink location={video_path}")
+    try:
+        writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, size)
+        if writer.isOpened():
+            return writer
+    except cv2.error:
+        pass
+    return cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'XVID'), fps, size)
+
+def _save_screenshot(path, image):
+    cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    print(f"📸 Screenshot saved: {path}")
+
+def start_recording(width, height):
+    global recording, video_writer
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    video_path = os.path.join(clips_dir, f"alert_{timestamp}.avi")
+    video_writer = _create_clip_writer(video_path, 20.0, (width, height))
+    
+    # Write buffered frames (pre-event)
+    for buffered_frame in frame_buffer:
+        video_writer.write(buffered_frame)
+    
+    recording = True
+    print(f"🎥 Started recording: {video_path}")
+    return video_path
+
+def _index_clip(video_path):
+    """Append the finished clip's metadata to outputs/clips/index.jsonl.
+
+    One JSON line per clip, written once at close time, so the web
+    dashboard can tail the index instead of re-stating the whole
+    clips directory on every page load.
+    """
+    filename = os.path.basename(video_path)
+    ts = filename[6:-4]
+    try:
+        entry = {
+            'filename': filename,
+            'date': f"{ts[0:4]}-{ts[4:6]}-{ts[6:8]}",
+            'time': f"{ts[9:11]}:{ts[11:13]}:{ts[13:15]}",
+            'size': f"{os.path.getsize(video_path) / (1024 * 1024):.2f}",
+        }
+        with open(os.path.join(clips_dir, "index.jsonl"), 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+def stop_recording():
+    global recording, video_writer
+    if video_writer:
+        # Release through the writer queue so it happens after every
+        # frame queued for this clip has been encoded; passing the
+        # path makes the writer thread index the clip once it's closed
+        write_q.put((video_writer, current_video_path))
+        video_writer = None
+        recording = False
+        print("⏹️  Recording stopped")
+
+# ==================== MODEL LOADING ====================
+# Prefer an ONNX Runtime session when the converted model is present:
+# ORT fuses conv kernels and can run on the CUDA EP, while cv2.dnn is
+# CPU-only for this model. Export once with darknet2onnx:
+#   python -m darknet2onnx cfg/yolov3.cfg weights/yolov3.weights weights/yolov3.onnx
+# The INT8 model (produced offline by quantize_model.py) is preferred:
+# quarter the weight traffic and integer conv paths on VNNI/Tensor-Core
+# hardware, with FP32 kept as the fallback.
+model_stem = "yolov3-tiny" if args.tiny else "yolov3"
+ONNX_MODELS = [os.path.join("weights", f"{model_stem}_int8.onnx"),
+               os.path.join("weights", f"{model_stem}.onnx")]
+ort_session = None
+
+print("🔄 Loading YOLOv3 model...")
+if HAS_ORT:
+    for model_path in ONNX_MODELS:
+        if not os.path.exists(model_path):
+            continue
+        try:
+            ort_session = ort.InferenceSession(
+                model_path,
+                providers=["TensorrtExecutionProvider",
+                           "CUDAExecutionProvider",
+                           "CPUExecutionProvider"])
+            ort_input_name = ort_session.get_inputs()[0].name
+            print(f"✅ ONNX Runtime session ready "
+                  f"({os.path.basename(model_path)}, {ort_session.get_providers()[0]})")
+            break
+        except Exception as e:
+            print(f"⚠️  Could not load {model_path}: {e}")
+            ort_session = None
+
+if ort_session is None:
+    net = cv2.dnn.readNet(f"weights/{model_stem}.weights", f"cfg/{model_stem}.cfg")
+    layer_names = net.getLayerNames()
+    output_layers = [layer_names[i - 1] for i in net.getUnconnectedOutLayers()]
+    
+    if args.cuda:
+        net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+        net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA_FP16)
+        # Warm-up forward on a zero blob pays the cuDNN autotune cost now
+        # instead of on the first real frame; failure means no FP16 path,
+        # so drop back to plain CUDA
+        warmup = np.zeros((1, 3, args.input_size, args.input_size), np.float32)
+        try:
+            net.setInput(warmup)
+            net.forward(output_layers)
+            print("✅ CUDA FP16 backend active")
+        except cv2.error:
+            net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+            net.setInput(warmup)
+            net.forward(output_layers)
+            print("✅ CUDA backend active (FP32)")
+
+classes = []
+with open("coco.names", "r") as f:
+    classes = [line.strip() for line in f.readlines()]
+
+# Plain int tuples: cv2 draw calls take them as Scalars directly, with no
+# per-call ndarray conversion
+colors = [tuple(int(c) for c in row)
+          for row in np.random.randint(0, 256, size=(len(classes), 3))]
+print("✅ Model loaded successfully")
+
+def run_inference(blob):
+    """Run one forward pass, via ORT when available else cv2.dnn"""
+    if ort_session is not None:
+        return ort_session.run(None, {ort_input_name: blob})
+    net.setInput(blob)
+    return net.forward(output_layers)
+
+# Warm-up pass on a zero blob regardless of backend: cuDNN algorithm
+# selection, EP graph build and allocator growth all happen here rather
+# than stalling the first real frame
+run_inference(np.zeros((1, 3, args.input_size, args.input_size), np.float32))
+print("✅ Warm-up inference complete")
+
+# ==================== VIDEO SOURCE ====================
+if args.source == "webcam":
+    cap = cv2.VideoCapture(0)
+    # MJPG instead of the YUYV default: raw YUYV at 720p+ saturates USB2
+    # and the driver caps the frame rate; MJPG decodes cheaply host-side
+    # and leaves bandwidth for 720p30
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    print("📹 Starting webcam feed...")
+else:
+    cap = cv2.VideoCapture(args.source)
+    print(f"📹 Processing video: {args.source}")
+
+if not cap.isOpened():
+    print("❌ Error: Could not open video source")
+    exit()
+
+# Initialize CSV logging
+init_csv_log()
+log_thread.start()
+
+# ==================== MAIN DETECTION LOOP ====================
+font = cv2.FONT_HERSHEY_PLAIN
+frame_count = 0
+fps_start_time = time.time()
+fps = 0
+recording_start_time = None
+current_video_path = None
+zone_patches = None  # per-zone color tiles, rendered lazily at first frame
+zone_map = None  # 16px-cell grid mapping a point to its zone index
+alert_triggered_objects = set()
+
+# ==================== DISPLAY THREAD ====================
+# imshow/waitKey tick the GUI event loop and can block for milliseconds;
+# they run on their own thread fed by a depth-1 queue. When the GUI is
+# still busy the frame is dropped rather than stalling the detector.
+display_q = queue.Queue(maxsize=1)
+quit_event = threading.Event()
+screenshot_event = threading.Event()
+
+def _displayer():
+    while True:
+        item = display_q.get()
+        if item is None:
+            break
+        cv2.imshow("Advanced YOLO Detection System", item)
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            quit_event.set()
+        elif key == ord('s'):
+            screenshot_event.set()
+    cv2.destroyAllWindows()
+
+display_thread = None
+if not args.no_display:
+    display_thread = threading.Thread(target=_displayer, daemon=True)
+    display_thread.start()
+
+# Optional OpenCL preprocessing: resize/convert/scale run on the device
+# through UMat instead of the host CPU
+USE_OPENCL = args.opencl and cv2.ocl.haveOpenCL()
+if args.opencl:
+    cv2.ocl.setUseOpenCL(True)
+    if not USE_OPENCL:
+        print("⚠️  OpenCL not available, preprocessing stays on CPU")
+
+# Preprocessing buffers allocated once and rewritten in place each frame,
+# instead of blobFromImage handing back a fresh multi-MB array per call
+input_size = args.input_size
+resized_buf = np.empty((input_size, input_size, 3), np.uint8)
+rgb_buf = np.empty((input_size, input_size, 3), np.uint8)
+blob = np.empty((1, 3, input_size, input_size), np.float32)
+
+# ==================== CAPTURE / ENCODE PIPELINE ====================
+# Decode and encode run on their own threads with shallow queues, so
+# grabbing frame N+1 and writing frame N-1 overlap inference of frame N.
+# Detection itself stays on the main thread: net, frame_buffer and the
+# detection counters need no locking that way.
+read_q = queue.Queue(maxsize=4)
+write_q = queue.Queue(maxsize=4)
+pipeline_stop = threading.Event()
+
+def _reader():
+    # Ring of preallocated frames: cap.read decodes into recycled slots,
+    # so steady state allocates nothing. Sized to the pre-event buffer
+    # plus every queue a frame can sit in, with margin, so a slot is
+    # never overwritten while something still references it.
+    pool = None
+    pool_idx = 0
+    while not pipeline_stop.is_set():
+        if pool is None:
+            ret, raw = cap.read()
+            if not ret:
+                break
+            pool_size = frame_buffer.maxlen + read_q.maxsize + write_q.maxsize + 8
+            pool = [np.empty_like(raw) for _ in range(pool_size)]
+        else:
+            ret, raw = cap.read(pool[pool_idx])
+            if not ret:
+                break
+            pool_idx = (pool_idx + 1) % len(pool)
+        while not pipeline_stop.is_set():
+            try:
+                read_q.put(raw, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+    read_q.put(None)
+
+def _writer():
+    while True:
+        item = write_q.get()
+        if item is None:
+            break
+        writer, out_frame = item
+        if out_frame is None or isinstance(out_frame, str):
+            writer.release()
+            if out_frame:
+                _index_clip(out_frame)
+        else:
+            writer.write(out_frame)
+
+reader_thread = threading.Thread(target=_reader, daemon=True)
+writer_thread = threading.Thread(target=_writer, daemon=True)
+reader_thread.start()
+writer_thread.start()
+
+print("\n🚀 System started! Press 'q' to quit, 's' to screenshot\n")
+
+while True:
+    frame = read_q.get()
+    if frame is None:
+        print("✅ Video stream ended")
+        break
+    
+    frame_count += 1
+    height, width, channels = frame.shape
+    
+    # Add frame to buffer. No copy needed: the reader's ring guarantees a
+    # slot outlives its stay in this deque. Overlays drawn below land on
+    # the buffered frame too, matching what the recorded stream looks like.
+    frame_buffer.append(frame)
+    
+    # Calculate FPS
+    if frame_count % 30 == 0:
+        fps = 30 / (time.time() - fps_start_time)
+        fps_start_time = time.time()
+    
+    # Draw ROI zones: blend a small static color tile into each zone's
+    # sub-rectangle in place, touching only the zone pixels instead of
+    # running a full-frame pass
+    if args.roi:
+        if zone_patches is None:
+            # Pre-crop each patch to its zone's intersection with the
+            # frame once - slicing silently clips, so a zone hanging
+            # off a small frame would otherwise feed addWeighted
+            # mismatched sizes. Fully off-frame zones get no patch.
+            zone_patches = []
+            for z in ROI_ZONES:
+                x, y, w, h = z["coords"]
+                x0, y0 = max(x, 0), max(y, 0)
+                x1, y1 = min(x + w, width), min(y + h, height)
+                if x1 <= x0 or y1 <= y0:
+                    zone_patches.append(None)
+                else:
+                    zone_patches.append((x0, y0,
+                                         np.full((y1 - y0, x1 - x0, 3),
+                                                 z["color"], np.uint8)))
+        for zone, patch in zip(ROI_ZONES, zone_patches):
+            x, y, w, h = zone["coords"]
+            if patch is not None:
+                px, py, tile = patch
+                sub = frame[py:py + tile.shape[0], px:px + tile.shape[1]]
+                cv2.addWeighted(sub, 0.7, tile, 0.3, 0, dst=sub)
+            cv2.rectangle(frame, (x, y), (x + w, y + h), zone["color"], 2)
+            cv2.putText(frame, zone["name"], (x, y-10), font, 1.5, zone["color"], 2)
+    
+    # YOLO Detection
+    # Detection every Nth frame: object positions move little between
+    # consecutive frames, so skip frames reuse the last boxes for drawing
+    # and ROI checks while the display keeps full frame rate
+    infer_frame = (frame_count - 1) % args.infer_stride == 0
+    if infer_frame:
+        if USE_OPENCL:
+            blob = cv2.dnn.blobFromImage(cv2.UMat(frame), 0.00392,
+                                         (input_size, input_size), (0, 0, 0),
+                                         True, crop=False)
+        else:
+            cv2.resize(frame, (input_size, input_size), dst=resized_buf)
+            cv2.cvtColor(resized_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+            np.multiply(rgb_buf.transpose(2, 0, 1), 0.00392, out=blob[0])
+        outs = run_inference(blob)
+        
+        boxes, confidences, class_ids = decode_detections(
+            outs, width, height, args.confidence)
+        
+        indexes = cv2.dnn.NMSBoxes(boxes, confidences, args.confidence, 0.4)
+    
+    object_counts = {}
+    roi_detections = {}
+    current_frame_alert_objects = set()
+    
+    # Zone membership via a precomputed lookup grid: each box center costs
+    # one indexed load regardless of how many zones are configured, with a
+    # precise bounds check only for centers whose 16px cell straddles an
+    # edge. Overlapping zones resolve to the later one in ROI_ZONES.
+    kept = np.asarray(indexes, dtype=np.intp).ravel()
+    zone_idx = None
+    if args.roi and kept.size:
+        if zone_map is None:
+            zone_map = np.full((height // 16 + 1, width // 16 + 1), -1, np.int8)
+            for zi, zone in enumerate(ROI_ZONES):
+                zx, zy, zw, zh = zone["coords"]
+                zone_map[zy // 16:(zy + zh) // 16 + 1,
+                         zx // 16:(zx + zw) // 16 + 1] = zi
+        boxes_np = np.asarray(boxes)[kept]
+        cxs = boxes_np[:, 0] + boxes_np[:, 2] // 2
+        cys = boxes_np[:, 1] + boxes_np[:, 3] // 2
+        gy = np.clip(cys // 16, 0, zone_map.shape[0] - 1)
+        gx = np.clip(cxs // 16, 0, zone_map.shape[1] - 1)
+        zone_idx = zone_map[gy, gx].astype(np.intp)
+        hit = zone_idx >= 0
+        if hit.any():
+            zc = ZONE_COORDS[zone_idx[hit]]
+            precise = ((cxs[hit] > zc[:, 0]) & (cxs[hit] < zc[:, 0] + zc[:, 2]) &
+                       (cys[hit] > zc[:, 1]) & (cys[hit] < zc[:, 1] + zc[:, 3]))
+            zone_idx[np.where(hit)[0][~precise]] = -1
+    
+    # Per-frame counts in one np.unique pass instead of per-box dict updates
+    if kept.size:
+        kept_cids = np.asarray(class_ids)[kept]
+        uniq, cnts = np.unique(kept_cids, return_counts=True)
+        object_counts = {classes[u]: int(c) for u, c in zip(uniq, cnts)}
+        if zone_idx is not None and (zone_idx >= 0).any():
+            uniq, cnts = np.unique(kept_cids[zone_idx >= 0], return_counts=True)
+            roi_detections = {classes[u]: int(c) for u, c in zip(uniq, cnts)}
+        if infer_frame:
+            total_detections.update(object_counts)
+    
+    for k, i in enumerate(kept):
+        x, y, w, h = boxes[i]
+        label = str(classes[class_ids[i]])
+        confidence = confidences[i]
+        color = colors[class_ids[i]]
+        
+        in_roi = False
+        zone_name = "Outside"
+        
+        # Zone assignment comes from the precomputed containment matrix
+        if zone_idx is not None and zone_idx[k] >= 0:
+            in_roi = True
+            zone_name = ROI_ZONES[zone_idx[k]]["name"]
+            color = (0, 0, 255)  # Red for ROI detections
+            
+            # Check if this object should trigger alert
+            if label.lower() in alert_objects:
+                current_frame_alert_objects.add(label)
+        
+        # Draw bounding box and label
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+        label_text = f"{label} {int(confidence * 100)}%"
+        cv2.putText(frame, label_text, (x, y - 5), font, 1.5, color, 2)
+        
+        # Log detection
+        if infer_frame:
+            log_detection(label, confidence, in_roi, zone_name, False)
+    
+    # Alert logic
+    current_time = time.time()
+    if (current_frame_alert_objects and 
+        args.roi and 
+        (current_time - last_alert_time) > alert_cooldown):
+        
+        if not recording:
+            current_video_path = start_recording(width, height)
+            recording_start_time = current_time
+            alert_triggered_objects = current_frame_alert_objects.copy()
+            last_alert_time = current_time
+    
+    # Display information panel
+    info_y = 30
+    cv2.putText(frame, f"FPS: {int(fps)}", (10, info_y), font, 2, (0, 255, 0), 2)
+    info_y += 35
+    
+    if args.roi:
+        cv2.putText(frame, f"ROI Detections:", (10, info_y), font, 2, (255, 255, 255), 2)
+        info_y += 30
+        for obj, count in roi_detections.items():
+            text = f"  {obj}: {count}"
+            color = (0, 0, 255) if obj.lower() in alert_objects else (0, 255, 0)
+            cv2.putText(frame, text, (10, info_y), font, 1.8, color, 2)
+            info_y += 25
+    else:
+        cv2.putText(frame, f"Total Detections:", (10, info_y), font, 2, (255, 255, 255), 2)
+        info_y += 30
+        for obj, count in object_counts.items():
+            cv2.putText(frame, f"  {obj}: {count}", (10, info_y), font, 1.8, (0, 255, 0), 2)
+            info_y += 25
+    
+    # Recording indicator
+    if recording:
+        cv2.circle(frame, (width - 30, 30), 10, (0, 0, 255), -1)
+        cv2.putText(frame, "REC", (width - 80, 40), font, 2, (0, 0, 255), 2)
+    
+    # Handle ongoing recording - after the last in-place draw, so the
+    # writer thread never encodes an ndarray this thread is still
+    # drawing HUD text onto (clips now include the HUD, deterministically)
+    if recording:
+        write_q.put((video_writer, frame))
+        elapsed = current_time - recording_start_time
+        
+        if elapsed >= args.record_duration:
+            stop_recording()
+            
+            # Send email in background thread
+            if EMAIL_CONFIG["enabled"] and current_video_path:
+                zone_detected = "ROI Zone"
+                threading.Thread(
+                    target=send_email_alert,
+                    args=(current_video_path, list(alert_triggered_objects), zone_detected),
+                    daemon=True
+                ).start()
+            
+            alert_triggered_objects.clear()
+    
+    # Display frame (dropped when the GUI thread is still on the last one)
+    if not args.no_display:
+        try:
+            display_q.put_nowait(frame)
+        except queue.Full:
+            pass
+    
+    # Key controls, signalled back from the display thread
+    if quit_event.is_set():
+        print("\n🛑 Shutting down...")
+        break
+    if screenshot_event.is_set():
+        screenshot_event.clear()
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        screenshot_path = os.path.join(screenshots_dir, f"screenshot_{timestamp}.jpg")
+        # Encode and write off-thread so the capture loop never blocks on
+        # disk; the copy is needed since the frame's ring slot gets reused
+        threading.Thread(target=_save_screenshot,
+                         args=(screenshot_path, frame.copy()),
+                         daemon=True).start()
+
+# Cleanup
+if recording:
+    stop_recording()
+
+pipeline_stop.set()
+write_q.put(None)
+writer_thread.join(timeout=5)
+reader_thread.join(timeout=2)
+
+log_queue.put(None)
+log_thread.join(timeout=5)
+
+if display_thread:
+    display_q.put(None)
+    display_thread.join(timeout=2)
+
+cap.release()
+
+# Print summary
+print("\n" + "="*50)
+print("📊 SESSION SUMMARY")
+print("="*50)
+print(f"Total Frames Processed: {frame_count}")
+print(f"Detection Log: {log_file}")
+for obj, count in total_detections.items():
+    print(f"  {obj}: {count}")
+print("="*50)
 print("✅ System shutdown complete")
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Offline INT8 quantization for the YOLOv3 ONNX model
+Produces weights/yolov3_int8.onnx, which main.py prefers automatically
+
+Quantized weights cut memory traffic 4x and use VNNI / Tensor Core
+integer paths where the hardware has them, for typically <1% mAP loss.
+
+Requires: pip install onnxruntime
+Usage: python quantize_model.py [--frames 100] [--source webcam] [--input-size 320]
+"""
+
+import argparse
+import glob
+import os
+
+import cv2
+import numpy as np
+from onnxruntime.quantization import (CalibrationDataReader, QuantFormat,
+                                      quantize_static)
+
+FP32_MODEL = os.path.join("weights", "yolov3.onnx")
+INT8_MODEL = os.path.join("weights", "yolov3_int8.onnx")
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds calibration blobs from a video source or screenshot folder"""
+
+    def __init__(self, input_name, frames):
+        self.input_name = input_name
+        self.iterator = iter(frames)
+
+    def get_next(self):
+        blob = next(self.iterator, None)
+        if blob is None:
+            return None
+        return {self.input_name: blob}
+
+
+def collect_frames(source, count):
+    """Grab calibration frames: the live source first, screenshots as backup"""
+    frames = []
+
+    cap = cv2.VideoCapture(0 if source == "webcam" else source)
+    while cap.isOpened() and len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+
+    if not frames:
+        for path in glob.glob("outputs/screenshots/*.jpg")[:count]:
+            img = cv2.imread(path)
+            if img is not None:
+                frames.append(img)
+
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize YOLOv3 ONNX model to INT8")
+    parser.add_argument("--frames", type=int, default=100,
+                        help="Number of calibration frames")
+    parser.add_argument("--source", type=str, default="webcam",
+                        help="Calibration source: 'webcam' or video file path")
+    parser.add_argument("--input-size", type=int, default=320,
+                        help="Calibration blob size; must match main.py's --input-size")
+    args = parser.parse_args()
+
+    if not os.path.exists(FP32_MODEL):
+        print(f"❌ {FP32_MODEL} not found - export it first with darknet2onnx")
+        return
+
+    print(f"🔄 Collecting {args.frames} calibration frames...")
+    frames = collect_frames(args.source, args.frames)
+    if not frames:
+        print("❌ No calibration frames available")
+        return
+
+    # Calibrate at the resolution inference actually runs at - ranges
+    # collected at the wrong size skew the activation scales, and a
+    # static-shape export would reject main.py's blobs outright
+    size = (args.input_size, args.input_size)
+    blobs = [cv2.dnn.blobFromImage(f, 0.00392, size, (0, 0, 0), True,
+                                   crop=False) for f in frames]
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(FP32_MODEL).get_inputs()[0].name
+
+    print(f"🔄 Quantizing {FP32_MODEL} over {len(blobs)} frames...")
+    quantize_static(FP32_MODEL, INT8_MODEL,
+                    FrameCalibrationReader(input_name, blobs),
+                    quant_format=QuantFormat.QDQ)
+
+    size_mb = os.path.getsize(INT8_MODEL) / (1024 * 1024)
+    print(f"✅ Saved {INT8_MODEL} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
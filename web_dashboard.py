@@ -7,17 +7,40 @@ Run: python web_dashboard.py
 Then open: http://localhost:5000
 """
 
-try:
-    from flask import Flask, render_template_string, send_file, jsonify
-    import pandas as pd
-    import os
-    import glob
-    from datetime import datetime
-except ImportError:
-    print("❌ Flask not installed. Install with: pip install flask")
-    exit(1)
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+def _scan_dir(path, prefix, suffix):
+    """List matching DirEntry objects in one directory pass.
+
+    scandir entries carry stat info cached from the directory read, so
+    size and mtime come without a follow-up stat per file.
+    """
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return []
+    with entries:
+        return [e for e in entries
+                if e.name.startswith(prefix) and e.name.endswith(suffix)]
 
-app = Flask(__name__)
+# Short TTL memo for the data helpers: browser refreshes inside the
+# window are served from RAM instead of re-reading every log and clip
+_cache = {}
+CACHE_TTL = 5.0
+
+def _cached(key, build):
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit and now - hit[0] < CACHE_TTL:
+        return hit[1]
+    value = build()
+    _cache[key] = (now, value)
+    return value
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -284,7 +307,92 @@ HTML_TEMPLATE = """
 """
 
 def get_statistics():
-    """Get detection statistics"""
+    """Get detection statistics (cached for a few seconds)"""
+    return _cached('stats', _compute_statistics)
+
+# Per-file running aggregates: (bytes parsed, rows, roi hits, alerts).
+# Only bytes appended since the last request are ever parsed again.
+_csv_cache = {}
+
+LOG_COLUMNS = ['Timestamp', 'Object', 'Confidence', 'In_ROI', 'Zone',
+               'Alert_Triggered']
+
+def _aggregate_log(entry):
+    """Incrementally aggregate one log file; returns (rows, roi, alerts).
+
+    Safe to run from worker threads: each file belongs to exactly one
+    worker per call and pd.read_csv releases the GIL while parsing.
+    Only bytes up to the stat'd size are consumed, and only up to the
+    last complete row - rows the recorder appends mid-read wait for
+    the next refresh instead of being double-counted, and a
+    half-written row never reaches the parser.
+    """
+    import pandas as pd
+    from io import BytesIO
+    
+    log_file = entry.path
+    try:
+        st = entry.stat()
+    except OSError:
+        return None
+    
+    size, rows, roi_sum, alert_sum = _csv_cache.get(log_file, (0, 0, 0, 0))
+    if st.st_size < size:
+        # File was rewritten; start over
+        size, rows, roi_sum, alert_sum = 0, 0, 0, 0
+    
+    if st.st_size > size:
+        try:
+            with open(log_file, 'rb') as f:
+                f.seek(size)
+                if size == 0:
+                    header = f.readline()
+                    if not header.endswith(b'\n'):
+                        return rows, roi_sum, alert_sum
+                    size = f.tell()
+                consumed = size
+                # Parse in bounded blocks so peak memory is one block
+                # of rows, not the whole file
+                while consumed < st.st_size:
+                    block = f.read(min(st.st_size - consumed, 1 << 22))
+                    if not block:
+                        break
+                    cut = block.rfind(b'\n')
+                    if cut < 0:
+                        break
+                    block = block[:cut + 1]
+                    df = pd.read_csv(BytesIO(block), header=None,
+                                     names=LOG_COLUMNS)
+                    rows += len(df)
+                    roi_sum += int(df['In_ROI'].sum())
+                    alert_sum += int(df['Alert_Triggered'].sum())
+                    consumed += len(block)
+                    f.seek(consumed)
+            _csv_cache[log_file] = (consumed, rows, roi_sum, alert_sum)
+        except Exception:
+            pass
+    
+    return rows, roi_sum, alert_sum
+
+def _parquet_stats(entries):
+    """Columnar aggregate over Parquet logs.
+
+    pyarrow reads just the two projected columns at the file level -
+    typed binary data, no text parsing - so days stored as Parquet
+    cost a fraction of their CSV equivalents.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    
+    table = ds.dataset([e.path for e in entries]).to_table(
+        columns=['In_ROI', 'Alert_Triggered'])
+    roi = pc.sum(pc.cast(table.column('In_ROI'), 'int64')).as_py() or 0
+    alerts = pc.sum(pc.cast(table.column('Alert_Triggered'), 'int64')).as_py() or 0
+    return table.num_rows, int(roi), int(alerts)
+
+def _compute_statistics():
+    from concurrent.futures import ThreadPoolExecutor
+    
     stats = {
         'total_detections': 0,
         'roi_detections': 0,
@@ -293,47 +401,90 @@ def get_statistics():
     }
     
     # Count videos
-    video_files = glob.glob("outputs/clips/alert_*.avi")
-    stats['video_count'] = len(video_files)
+    stats['video_count'] = len(_scan_dir("outputs/clips", "alert_", ".avi"))
     
-    # Read logs
-    log_files = glob.glob("outputs/logs/detections_*.csv")
-    if log_files:
-        all_data = []
-        for log_file in log_files:
-            try:
-                df = pd.read_csv(log_file)
-                all_data.append(df)
-            except:
-                pass
-        
-        if all_data:
-            combined_df = pd.concat(all_data, ignore_index=True)
-            stats['total_detections'] = len(combined_df)
-            stats['roi_detections'] = combined_df['In_ROI'].sum()
-            stats['alert_count'] = combined_df['Alert_Triggered'].sum()
+    # Aggregate log files in parallel: disk reads and the C-level CSV
+    # parse overlap across files, so many days of history cost about as
+    # much wall time as the largest single file
+    entries = _scan_dir("outputs/logs", "detections_", ".csv")
+    if entries:
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4,
+                                                len(entries))) as ex:
+            for result in ex.map(_aggregate_log, entries):
+                if result:
+                    stats['total_detections'] += result[0]
+                    stats['roi_detections'] += result[1]
+                    stats['alert_count'] += result[2]
+    
+    # Days converted to Parquet (columnar, typed) aggregate through
+    # pyarrow's projected reads on top of whatever is still CSV
+    pq_entries = _scan_dir("outputs/logs", "detections_", ".parquet")
+    if pq_entries:
+        try:
+            rows, roi, alerts = _parquet_stats(pq_entries)
+            stats['total_detections'] += rows
+            stats['roi_detections'] += roi
+            stats['alert_count'] += alerts
+        except Exception:
+            pass
     
     return stats
 
 def get_recent_videos(limit=12):
-    """Get recent video clips"""
-    video_files = sorted(glob.glob("outputs/clips/alert_*.avi"), reverse=True)[:limit]
-    
+    """Get recent video clips (cached for a few seconds)"""
+    return _cached(('videos', limit), lambda: _list_recent_videos(limit))
+
+def _list_recent_videos(limit):
+    # The recorder appends one JSON line per finished clip to
+    # index.jsonl, so the newest N are just the tail of that file -
+    # no directory scan, no per-clip stat
+    index_path = os.path.join("outputs/clips", "index.jsonl")
     videos = []
-    for video_path in video_files:
-        filename = os.path.basename(video_path)
-        timestamp = filename.replace('alert_', '').replace('.avi', '')
+    try:
+        with open(index_path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 65536))
+            lines = f.read().splitlines()
+        if size > 65536:
+            lines = lines[1:]  # first line may be partial
+        for line in reversed(lines):
+            video = json.loads(line)
+            if os.path.exists(os.path.join("outputs/clips",
+                                           video['filename'])):
+                videos.append(video)
+            if len(videos) >= limit:
+                break
+        if len(videos) >= limit:
+            return videos
+    except (OSError, ValueError, KeyError):
+        videos = []
+    
+    # Index missing or short (clips recorded before it existed don't
+    # appear in it): top up from a directory scan, skipping filenames
+    # the index already covered. Filenames sort chronologically, so
+    # the newest clips are just the lexicographically largest names -
+    # nlargest picks them in one O(N) pass instead of sorting the
+    # whole directory to show a dozen
+    indexed = {v['filename'] for v in videos}
+    entries = heapq.nlargest(limit, _scan_dir("outputs/clips", "alert_", ".avi"),
+                             key=lambda e: e.name)
+    
+    for entry in entries:
+        if len(videos) >= limit:
+            break
+        if entry.name in indexed:
+            continue
+        filename = entry.name
+        ts = filename[6:-4]  # strip 'alert_' and '.avi', one slice not two replaces
         
         try:
-            date_part = timestamp[:8]
-            time_part = timestamp[9:]
-            date = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}"
-            time = f"{time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}"
+            date = f"{ts[0:4]}-{ts[4:6]}-{ts[6:8]}"
+            time = f"{ts[9:11]}:{ts[11:13]}:{ts[13:15]}"
         except:
             date = "Unknown"
             time = "Unknown"
         
-        size = os.path.getsize(video_path) / (1024 * 1024)
+        size = entry.stat().st_size / (1024 * 1024)
         
         videos.append({
             'filename': filename,
@@ -342,70 +493,162 @@ def get_recent_videos(limit=12):
             'size': f"{size:.2f}"
         })
     
+    videos.sort(key=lambda v: v['filename'], reverse=True)
     return videos
 
+def _tail_rows(path, limit, window=65536):
+    """Parse at most `limit` trailing rows from a log CSV.
+
+    Seeks to the last ~64 KiB, drops the partial first line, and feeds
+    only the surviving tail (plus the header read once from the front)
+    to pandas - O(limit) work however large the day's file has grown.
+    """
+    import pandas as pd
+    from io import BytesIO
+    
+    try:
+        with open(path, 'rb') as f:
+            header = f.readline()
+            f.seek(0, 2)
+            size = f.tell()
+            start = max(len(header), size - window)
+            f.seek(start)
+            chunk = f.read()
+        
+        lines = chunk.split(b'\n')
+        if start > len(header):
+            lines = lines[1:]  # first line is almost surely cut mid-row
+        tail = [line for line in lines if line][-limit:]
+        if not tail:
+            return None
+        
+        return pd.read_csv(BytesIO(b'\n'.join([header.rstrip(b'\r\n')] + tail)),
+                           usecols=['Timestamp', 'Object', 'Confidence',
+                                    'Zone', 'In_ROI'],
+                           dtype=str)
+    except Exception:
+        return None
+
 def get_recent_logs(limit=20):
-    """Get recent detection logs"""
-    log_files = sorted(glob.glob("outputs/logs/detections_*.csv"), reverse=True)
+    """Get recent detection logs (cached for a few seconds)"""
+    return _cached(('logs', limit), lambda: _read_recent_logs(limit))
+
+def _read_recent_logs(limit):
+    log_files = sorted((e.path for e in _scan_dir("outputs/logs",
+                                                   "detections_", ".csv")),
+                       reverse=True)
     
     if not log_files:
         return []
     
     recent_logs = []
     for log_file in log_files[:3]:  # Check last 3 days
-        try:
-            df = pd.read_csv(log_file)
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-            df = df.sort_values('Timestamp', ascending=False)
-            
-            for _, row in df.head(limit).iterrows():
-                recent_logs.append({
-                    'time': row['Timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-                    'object': row['Object'],
-                    'confidence': int(float(row['Confidence']) * 100),
-                    'zone': row['Zone'],
-                    'in_roi': row['In_ROI']
-                })
-                
-                if len(recent_logs) >= limit:
-                    break
-            
-            if len(recent_logs) >= limit:
-                break
-        except:
+        df = _tail_rows(log_file, limit)
+        if df is None:
             continue
+        
+        # Rows are appended in time order and already carry the display
+        # format, so the newest entries are just the file tail - no
+        # full-column to_datetime and no sort
+        needed = limit - len(recent_logs)
+        for row in df.tail(needed).iloc[::-1].itertuples(index=False):
+            recent_logs.append({
+                'time': row.Timestamp,
+                'object': row.Object,
+                'confidence': int(float(row.Confidence) * 100),
+                'zone': row.Zone,
+                'in_roi': row.In_ROI == 'True'
+            })
+        
+        # Newest file usually has >= limit rows; older days stay untouched
+        if len(recent_logs) >= limit:
+            break
     
     return recent_logs
 
-@app.route('/')
-def index():
-    """Main dashboard page"""
-    stats = get_statistics()
-    videos = get_recent_videos()
-    recent_logs = get_recent_logs()
+# Pre-serialized stats for the polled API endpoint, maintained by a
+# background thread so request latency never includes disk I/O
+_stats_json = None
+
+def _refresh_loop(interval=5.0):
+    global _stats_json
+    while True:
+        try:
+            _stats_json = json.dumps(get_statistics()).encode()
+        except Exception:
+            pass
+        time.sleep(interval)
+
+def get_app():
+    """Build the Flask app on demand.
+
+    Flask and pandas dominate cold-start time, so the module imports
+    nothing heavy at top level - mirrors the lazy imports in setup.py's
+    verification helpers.
+    """
+    try:
+        from flask import Flask, abort, jsonify, send_from_directory
+        from werkzeug.exceptions import NotFound
+        from werkzeug.utils import secure_filename
+    except ImportError:
+        print("❌ Flask not installed. Install with: pip install flask")
+        exit(1)
+    
+    app = Flask(__name__)
+    # Let browsers cache static responses for an hour
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+    # Compile the inline template once; render_template_string would
+    # re-parse the ~8 KB of Jinja on every request
+    dashboard_tpl = app.jinja_env.from_string(HTML_TEMPLATE)
+    
+    @app.after_request
+    def add_range_header(response):
+        # Advertise byte ranges so browsers can scrub/partial-fetch clips
+        response.headers.setdefault('Accept-Ranges', 'bytes')
+        return response
+    
+    @app.route('/')
+    def index():
+        """Main dashboard page"""
+        stats = get_statistics()
+        videos = get_recent_videos()
+        recent_logs = get_recent_logs()
+        
+        return dashboard_tpl.render(
+            total_detections=stats['total_detections'],
+            roi_detections=stats['roi_detections'],
+            alert_count=stats['alert_count'],
+            video_count=stats['video_count'],
+            videos=videos,
+            recent_logs=recent_logs
+        )
+    
+    @app.route('/video/<filename>')
+    def get_video(filename):
+        """Serve video file.
+
+        send_from_directory with conditional=True answers 304s and
+        Range requests and streams through the OS sendfile path, so
+        repeat downloads and scrubbing don't re-copy the whole clip
+        through userspace.
+        """
+        try:
+            return send_from_directory("outputs/clips",
+                                       secure_filename(filename),
+                                       as_attachment=True, conditional=True)
+        except NotFound:
+            abort(404)
+    
+    @app.route('/api/stats')
+    def api_stats():
+        """API endpoint for statistics"""
+        # The refresher keeps ready-to-send bytes; jsonify only runs
+        # before the first refresh completes
+        if _stats_json is not None:
+            return app.response_class(_stats_json, mimetype='application/json')
+        return jsonify(get_statistics())
     
-    return render_template_string(
-        HTML_TEMPLATE,
-        total_detections=stats['total_detections'],
-        roi_detections=stats['roi_detections'],
-        alert_count=stats['alert_count'],
-        video_count=stats['video_count'],
-        videos=videos,
-        recent_logs=recent_logs
-    )
-
-@app.route('/video/<filename>')
-def get_video(filename):
-    """Serve video file"""
-    video_path = os.path.join("outputs/clips", filename)
-    if os.path.exists(video_path):
-        return send_file(video_path, as_attachment=True)
-    return "Video not found", 404
-
-@app.route('/api/stats')
-def api_stats():
-    """API endpoint for statistics"""
-    return jsonify(get_statistics())
+    return app
 
 if __name__ == '__main__':
     print("""
@@ -421,4 +664,13 @@ if __name__ == '__main__':
 
     """)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    threading.Thread(target=_refresh_loop, daemon=True).start()
+    app = get_app()
+    try:
+        # waitress serves requests from a thread pool; the Flask dev
+        # server (and debug=True's reloader) handles one at a time,
+        # so a large clip download used to stall the whole dashboard
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=8)
+    except ImportError:
+        app.run(host='0.0.0.0', port=5000)
\ No newline at end of file